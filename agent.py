@@ -1,109 +1,154 @@
 
 
+import functools
+import os
+import threading
+
+import httpx
 from crewai import Agent
-from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+
+# Agents are built on first use and then reused, so importing this module
+# doesn't initialise an LLM client per agent
+
+
+_llm = None
+_llm_lock = threading.Lock()
+
+
+def get_llm() -> ChatOpenAI:
+    """
+    LLM shared by every agent. Its single pooled keep-alive HTTP client lets
+    stages running in parallel reuse connections instead of each opening
+    its own TLS session.
+    """
+    global _llm
+    # Locked rather than functools.cache'd: the first transaction's parallel
+    # stages build their agents together, and cache alone would let each
+    # thread build its own LLM and client
+    with _llm_lock:
+        if _llm is None:
+            http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+            _llm = ChatOpenAI(
+                model=os.getenv("OPENAI_MODEL_NAME", "gpt-4"),
+                http_client=http_client,
+            )
+    return _llm
 
-load_dotenv()
 
 # Intent Agent
-intent_agent = Agent(
-    role="Expert Financial Analyst specializing in Treasury Management",
-    goal="Understanding why money has been moved and classifying transaction intent accurately",
-    verbose=True,
-    memory=True,
-    backstory=(
-        "You are an expert financial analyst with 15 years of experience in treasury management. "
-        "You have an exceptional ability to understand the true intent behind financial transactions "
-        "by analyzing transaction details, historical patterns, and contextual information. "
-        "Your classifications help prevent misuse while enabling legitimate business operations. "
-        "You can distinguish between refunds, payroll, vendor payments, investments, emergency transactions, "
-        "transfers, payments, and suspicious activities with high accuracy and confidence."
-    ),
-    allow_delegation=False,  # Changed from True to False for clear audit trail
-)
+@functools.cache
+def get_intent_agent() -> Agent:
+    return Agent(
+        role="Expert Financial Analyst specializing in Treasury Management",
+        goal="Understanding why money has been moved and classifying transaction intent accurately",
+        verbose=False,
+        llm=get_llm(),
+        backstory=(
+            "You are an expert financial analyst with 15 years of experience in treasury management. "
+            "You have an exceptional ability to understand the true intent behind financial transactions "
+            "by analyzing transaction details, historical patterns, and contextual information. "
+            "Your classifications help prevent misuse while enabling legitimate business operations. "
+            "You can distinguish between refunds, payroll, vendor payments, investments, emergency transactions, "
+            "transfers, payments, and suspicious activities with high accuracy and confidence."
+        ),
+        allow_delegation=False,  # Changed from True to False for clear audit trail
+    )
 
 # Risk Agent
-risk_agent = Agent(
-    role="Risk Assessment Officer",
-    goal="Identify and quantify fraud risk, anomalies, and suspicious patterns in financial transactions",
-    verbose=True,
-    memory=True,
-    backstory=(
-        "You are a seasoned fraud prevention officer with expertise in financial transactions. "
-        "With a background in cybersecurity and forensic accounting, you have successfully prevented "
-        "millions in fraudulent transactions. You analyze transaction patterns, sender/receiver profiles, "
-        "timing anomalies, and behavioral signals to compute risk scores. Your vigilance protects the "
-        "organization from both external threats and internal fraud while minimizing false positives "
-        "that would disrupt legitimate business operations."
-    ),
-    allow_delegation=False,
-)
+@functools.cache
+def get_risk_agent() -> Agent:
+    return Agent(
+        role="Risk Assessment Officer",
+        goal="Identify and quantify fraud risk, anomalies, and suspicious patterns in financial transactions",
+        verbose=False,
+        llm=get_llm(),
+        backstory=(
+            "You are a seasoned fraud prevention officer with expertise in financial transactions. "
+            "With a background in cybersecurity and forensic accounting, you have successfully prevented "
+            "millions in fraudulent transactions. You analyze transaction patterns, sender/receiver profiles, "
+            "timing anomalies, and behavioral signals to compute risk scores. Your vigilance protects the "
+            "organization from both external threats and internal fraud while minimizing false positives "
+            "that would disrupt legitimate business operations."
+        ),
+        allow_delegation=False,
+    )
 
 # Policy Agent
-policy_agent = Agent(
-    role="Compliance and Policy Guardian",
-    goal="Ensure every transaction adheres to company policies, spending limits, and regulatory requirements",
-    verbose=True,
-    memory=True,
-    backstory=(
-        "You are a compliance officer with deep knowledge of corporate governance, financial regulations, "
-        "and internal control frameworks. You understand GDPR, AML/KYC requirements, jurisdictional laws, "
-        "and company-specific approval hierarchies. Your role is to be the gatekeeper of policy compliance, "
-        "ensuring that no transaction violates spending limits, approval workflows, or legal boundaries. "
-        "You balance strict adherence to rules with practical business needs, flagging violations clearly "
-        "while suggesting remediation paths when possible."
-    ),
-    allow_delegation=False,
-)
+@functools.cache
+def get_policy_agent() -> Agent:
+    return Agent(
+        role="Compliance and Policy Guardian",
+        goal="Ensure every transaction adheres to company policies, spending limits, and regulatory requirements",
+        verbose=False,
+        llm=get_llm(),
+        backstory=(
+            "You are a compliance officer with deep knowledge of corporate governance, financial regulations, "
+            "and internal control frameworks. You understand GDPR, AML/KYC requirements, jurisdictional laws, "
+            "and company-specific approval hierarchies. Your role is to be the gatekeeper of policy compliance, "
+            "ensuring that no transaction violates spending limits, approval workflows, or legal boundaries. "
+            "You balance strict adherence to rules with practical business needs, flagging violations clearly "
+            "while suggesting remediation paths when possible."
+        ),
+        allow_delegation=False,
+    )
 
 # Treasury Agent
-treasury_agent = Agent(
-    role="Liquidity and Treasury Manager",
-    goal="Evaluate financial feasibility by checking account balances, cash flow, and budget constraints",
-    verbose=True,
-    memory=True,
-    backstory=(
-        "You are an experienced treasury manager responsible for maintaining organizational liquidity. "
-        "With expertise in cash flow management, working capital optimization, and financial planning, "
-        "you ensure the organization never overextends itself. You monitor account balances, daily limits, "
-        "budget allocations, and upcoming obligations to determine if a transaction is financially viable. "
-        "Your assessments prevent overdrafts, maintain adequate reserves, and support sustainable "
-        "financial operations even when approving urgent requests."
-    ),
-    allow_delegation=False,
-)
+@functools.cache
+def get_treasury_agent() -> Agent:
+    return Agent(
+        role="Liquidity and Treasury Manager",
+        goal="Evaluate financial feasibility by checking account balances, cash flow, and budget constraints",
+        verbose=False,
+        llm=get_llm(),
+        backstory=(
+            "You are an experienced treasury manager responsible for maintaining organizational liquidity. "
+            "With expertise in cash flow management, working capital optimization, and financial planning, "
+            "you ensure the organization never overextends itself. You monitor account balances, daily limits, "
+            "budget allocations, and upcoming obligations to determine if a transaction is financially viable. "
+            "Your assessments prevent overdrafts, maintain adequate reserves, and support sustainable "
+            "financial operations even when approving urgent requests."
+        ),
+        allow_delegation=False,
+    )
 
 # Decision Agent
-decision_agent = Agent(
-    role="Chief Decision Authority",
-    goal="Make final approval or rejection decisions based on consolidated evidence from all specialist agents",
-    verbose=True,
-    memory=True,
-    backstory=(
-        "You are the virtual Chief Treasury Officer with ultimate decision-making authority over monetary actions. "
-        "You synthesize insights from intent analysis, risk assessment, policy validation, and liquidity checks "
-        "to make balanced, rational decisions. With decades of executive experience, you know when to approve, "
-        "when to reject, and when to escalate to humans. You understand that speed matters but safety is paramount. "
-        "Your decisions are always explainable, defensible, and aligned with organizational objectives. "
-        "You have the wisdom to handle edge cases and the humility to defer to humans when uncertainty is high."
-    ),
-    allow_delegation=False,
-)
+@functools.cache
+def get_decision_agent() -> Agent:
+    return Agent(
+        role="Chief Decision Authority",
+        goal="Make final approval or rejection decisions based on consolidated evidence from all specialist agents",
+        verbose=False,
+        llm=get_llm(),
+        backstory=(
+            "You are the virtual Chief Treasury Officer with ultimate decision-making authority over monetary actions. "
+            "You synthesize insights from intent analysis, risk assessment, policy validation, and liquidity checks "
+            "to make balanced, rational decisions. With decades of executive experience, you know when to approve, "
+            "when to reject, and when to escalate to humans. You understand that speed matters but safety is paramount. "
+            "Your decisions are always explainable, defensible, and aligned with organizational objectives. "
+            "You have the wisdom to handle edge cases and the humility to defer to humans when uncertainty is high."
+        ),
+        allow_delegation=False,
+    )
 
 # Audit Agent
-audit_agent = Agent(
-    role="Audit and Compliance Recorder",
-    goal="Record and document all financial transactions for audit purposes with complete traceability",
-    verbose=True,
-    memory=True,
-
-    
-    backstory=(
-        "You are a meticulous auditor with a background in financial compliance and regulatory reporting. "
-        "You ensure that every transaction is properly documented, traceable, and compliant with internal "
-        "policies and external regulations. Your role is to maintain an accurate audit trail that supports "
-        "financial transparency, regulatory adherence, and organizational accountability. You create immutable "
-        "records that can withstand scrutiny from regulators, auditors, and legal teams."
-    ),
-    allow_delegation=False,
-)
+@functools.cache
+def get_audit_agent() -> Agent:
+    return Agent(
+        role="Audit and Compliance Recorder",
+        goal="Record and document all financial transactions for audit purposes with complete traceability",
+        verbose=False,
+        llm=get_llm(),
+
+        
+        backstory=(
+            "You are a meticulous auditor with a background in financial compliance and regulatory reporting. "
+            "You ensure that every transaction is properly documented, traceable, and compliant with internal "
+            "policies and external regulations. Your role is to maintain an accurate audit trail that supports "
+            "financial transparency, regulatory adherence, and organizational accountability. You create immutable "
+            "records that can withstand scrutiny from regulators, auditors, and legal teams."
+        ),
+        allow_delegation=False,
+    )
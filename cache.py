@@ -0,0 +1,92 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class TransactionCache:
+    """
+    Exact-match cache for agent stage outputs
+
+    Repeat-pattern transactions (same counterparties, amount, purpose and
+    time slot) produce the same intent/risk/policy assessment, so the stage
+    output is stored under a SHA-256 of those features and reused until it
+    expires. Thread-safe, so stages running in parallel can share it.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(stage: str, transaction_data: Dict[str, Any], intent_output: Any = None) -> str:
+        """
+        Hash the transaction features a stage's output depends on. Stages
+        downstream of intent pass its output, so that an intent entry
+        expiring first can't leave them serving results built on an
+        earlier classification.
+        """
+        # Amounts are keyed exactly rather than bucketed: spending limits and
+        # approval levels are hard thresholds, so a bucket could straddle one
+        try:
+            tx_time = datetime.fromisoformat(str(transaction_data.get("timestamp", "")))
+            hour, weekday = tx_time.hour, tx_time.weekday()
+        except ValueError:
+            hour, weekday = None, None
+
+        # Risk and policy follow the intent label and urgency; an intent
+        # output that isn't JSON is keyed on its whole text instead
+        intent_features = None
+        if intent_output is not None:
+            try:
+                intent = json.loads(str(intent_output))
+            except ValueError:
+                intent = None
+            if isinstance(intent, dict):
+                intent_features = [
+                    str(intent.get("intent", "")).strip().lower(),
+                    str(intent.get("urgency", "")).strip().lower(),
+                ]
+            else:
+                intent_features = " ".join(str(intent_output).split())
+
+        features = [
+            stage,
+            str(transaction_data.get("sender", "")).strip().lower(),
+            str(transaction_data.get("receiver", "")).strip().lower(),
+            round(float(transaction_data.get("amount", 0)), 2),
+            " ".join(str(transaction_data.get("purpose", "")).lower().split()),
+            str(transaction_data.get("account_id", "primary")),
+            # Counterparty standing moves as decisions are recorded
+            str(transaction_data.get("sender_history", "unknown")),
+            hour,
+            weekday,
+            intent_features,
+        ]
+        return hashlib.sha256(json.dumps(features).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,228 @@
+import orjson
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+from tool import (
+    IntentAnalysisTool,
+    RiskAssessmentTool,
+    PolicyValidationTool,
+    LiquidityCheckTool,
+    AuditLogTool,
+    SPENDING_LIMITS
+)
+
+
+class FastPathRegistry:
+    """
+    Deterministic shortcuts for pipeline stages
+
+    Rules registered for a stage are tried in order before the stage's agent
+    runs. A rule returns the stage output when the case is routine enough to
+    decide in code, or None to fall back to the LLM agent.
+    """
+
+    def __init__(self):
+        self._rules = defaultdict(list)
+
+    def register(self, stage: str) -> Callable:
+        """Decorator registering a rule for the given stage"""
+        def decorator(rule: Callable) -> Callable:
+            self._rules[stage].append(rule)
+            return rule
+        return decorator
+
+    def resolve(self, stage: str, transaction_data: Dict[str, Any], results: Dict[str, Any]) -> Optional[str]:
+        """Return the first rule result for stage, or None if no rule applies"""
+        for rule in self._rules.get(stage, ()):
+            result = rule(transaction_data, results)
+            if result is not None:
+                return result
+        return None
+
+
+fast_paths = FastPathRegistry()
+
+_intent_tool = IntentAnalysisTool()
+_risk_tool = RiskAssessmentTool()
+_policy_tool = PolicyValidationTool()
+_liquidity_tool = LiquidityCheckTool()
+_audit_tool = AuditLogTool()
+
+# Risk factors that on their own don't warrant an LLM review
+_ROUTINE_RISK_FACTORS = {"unknown_sender_history", "new_sender"}
+
+
+def _flagged_counterparty(transaction_data: Dict[str, Any]) -> bool:
+    """Whether an earlier payment to this receiver was rejected or escalated"""
+    return transaction_data.get("sender_history") == "flagged"
+
+
+def _parse(output: Any) -> Optional[Dict[str, Any]]:
+    """Parse a stage output as a JSON object, or None if it isn't one"""
+    try:
+        parsed = orjson.loads(str(output))
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _tool_intent(output: Any) -> Optional[str]:
+    """
+    Map an intent stage output onto the tools' intent labels (the
+    SPENDING_LIMITS keys), or None if it doesn't parse or names a class
+    the tools don't know, e.g. "suspicious" or "transfer"
+    """
+    label = str((_parse(output) or {}).get("intent", "")).lower()
+    for intent in SPENDING_LIMITS:
+        # The agent uses longer labels for the same classes, e.g. "vendor_payment"
+        if label == intent or label.startswith(intent + "_"):
+            return intent
+    return None
+
+
+def guess_intent(transaction_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Cheap keyword-based intent guess, used to start intent-dependent stages
+    speculatively while the intent agent is still running
+    """
+    output = _intent_tool._run(
+        amount=float(transaction_data["amount"]),
+        sender=transaction_data.get("sender", ""),
+        receiver=transaction_data.get("receiver", ""),
+        purpose=transaction_data.get("purpose", ""),
+        timestamp=transaction_data["timestamp"]
+    )
+    return None if orjson.loads(output)["intent"] == "general" else output
+
+
+def same_intent(guess: str, actual: Any) -> bool:
+    """Whether the final intent output agrees with a guess from guess_intent"""
+    guessed = _tool_intent(guess)
+    return guessed is not None and guessed == _tool_intent(actual)
+
+
+@fast_paths.register("intent")
+def _keyword_intent(transaction_data: Dict[str, Any], results: Dict[str, Any]) -> Optional[str]:
+    """Clear keyword match during business hours"""
+    output = _intent_tool._run(
+        amount=float(transaction_data["amount"]),
+        sender=transaction_data.get("sender", ""),
+        receiver=transaction_data.get("receiver", ""),
+        purpose=transaction_data.get("purpose", ""),
+        timestamp=transaction_data["timestamp"]
+    )
+    intent = orjson.loads(output)
+    if intent["confidence"] >= 0.95 and not intent["is_off_hours"] and intent["urgency"] != "high":
+        return output
+    return None
+
+
+@fast_paths.register("risk")
+def _routine_risk(transaction_data: Dict[str, Any], results: Dict[str, Any]) -> Optional[str]:
+    """Low risk with no timing, amount or receiver signals"""
+    if _flagged_counterparty(transaction_data):
+        return None
+    intent = _tool_intent(results["intent"])
+    if intent is None:
+        return None
+    output = _risk_tool._run(
+        amount=float(transaction_data["amount"]),
+        sender=transaction_data.get("sender", ""),
+        receiver=transaction_data.get("receiver", ""),
+        intent=intent,
+        timestamp=transaction_data["timestamp"],
+        sender_history=transaction_data.get("sender_history", "unknown")
+    )
+    risk = orjson.loads(output)
+    if risk["risk_level"] == "low" and set(risk["risk_factors"]) <= _ROUTINE_RISK_FACTORS:
+        return output
+    return None
+
+
+@fast_paths.register("policy")
+def _compliant_policy(transaction_data: Dict[str, Any], results: Dict[str, Any]) -> Optional[str]:
+    """Within limits with no violations or warnings"""
+    intent = _tool_intent(results["intent"])
+    if intent is None:
+        return None
+    output = _policy_tool._run(
+        amount=float(transaction_data["amount"]),
+        intent=intent,
+        sender=transaction_data.get("sender", ""),
+        receiver=transaction_data.get("receiver", ""),
+        urgency=str(_parse(results["intent"]).get("urgency", "medium"))
+    )
+    policy = orjson.loads(output)
+    if policy["policy_passed"] and not policy["warnings"]:
+        return output
+    return None
+
+
+@fast_paths.register("treasury")
+def _healthy_liquidity(transaction_data: Dict[str, Any], results: Dict[str, Any]) -> Optional[str]:
+    """Affordable without warnings or cash-flow concerns"""
+    output = _liquidity_tool._run(
+        amount=float(transaction_data["amount"]),
+        account_id=transaction_data.get("account_id", "primary")
+    )
+    liquidity = orjson.loads(output)
+    if liquidity["financially_viable"] and not liquidity["warnings"] and not liquidity["concerns"]:
+        return output
+    return None
+
+
+@fast_paths.register("decision")
+def _all_green_decision(transaction_data: Dict[str, Any], results: Dict[str, Any]) -> Optional[str]:
+    """Approve when every specialist stage came back green"""
+    if _flagged_counterparty(transaction_data):
+        return None
+    # A red flag, a "suspicious" intent or an unclassified purpose is the
+    # agent's call, even when the tools found nothing wrong
+    if _tool_intent(results["intent"]) in (None, "general"):
+        return None
+    if _parse(results["intent"]).get("red_flags"):
+        return None
+    risk = _parse(results["risk"]) or {}
+    policy = _parse(results["policy"]) or {}
+    liquidity = _parse(results["treasury"]) or {}
+    if not (
+        risk.get("risk_level") == "low"
+        and policy.get("policy_passed") is True
+        and liquidity.get("financially_viable") is True
+    ):
+        return None
+
+    decision = {
+        "decision": "approve",
+        "confidence": 0.95,
+        "overall_risk_level": "low",
+        "decision_factors": {
+            "risk_score": risk.get("risk_score"),
+            "policy_score": policy.get("compliance_score"),
+        },
+        "blocking_issues": [],
+        "green_lights": ["low risk", "policy compliant", "sufficient funds"],
+        "next_steps": ["execute transaction"],
+        "human_escalation_reason": "",
+        "reasoning": "Routine transaction: every specialist check passed deterministically",
+        "execution_instructions": "Execute immediately"
+    }
+    return orjson.dumps(decision, option=orjson.OPT_SORT_KEYS).decode()
+
+
+@fast_paths.register("audit")
+def _structured_audit(transaction_data: Dict[str, Any], results: Dict[str, Any]) -> Optional[str]:
+    """Record structured decisions straight through the audit tool"""
+    decision = _parse(results["decision"])
+    if decision is None or "decision" not in decision:
+        return None
+    agent_outputs = {
+        stage: str(results[stage])
+        for stage in ("intent", "risk", "policy", "treasury", "decision")
+    }
+    return _audit_tool._run(
+        transaction_id=transaction_data.get("transaction_id", "TXN-001"),
+        decision=str(decision["decision"]).upper(),
+        agent_outputs=orjson.dumps(agent_outputs).decode(),
+        rationale=decision.get("reasoning", "")
+    )
@@ -0,0 +1,121 @@
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List
+
+_DECISIONS = frozenset({"approve", "reject", "escalate"})
+_DECISION_PATTERN = re.compile(r"\b(approve|reject|escalate)", re.IGNORECASE)
+
+# Earlier outcomes that put a receiver under review
+_ADVERSE_DECISIONS = frozenset({"reject", "escalate"})
+
+
+def _parse_decision(decision_output: str) -> str:
+    """
+    Outcome of a decision stage output: its structured "decision" field,
+    or else the first decision word in free text, or "unknown"
+    """
+    try:
+        parsed = json.loads(decision_output)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, dict):
+        decision = str(parsed.get("decision", "")).strip().lower()
+        if decision in _DECISIONS:
+            return decision
+    match = _DECISION_PATTERN.search(decision_output)
+    return match.group(1).lower() if match else "unknown"
+
+
+class TransactionMemory:
+    """
+    Shared history of processed transactions
+
+    Replaces isolated per-agent memory: every stage sees the same record of
+    earlier transactions, fetched by counterparty with an indexed SQLite
+    lookup and handed to the agents as the {history} task input.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS transactions ("
+                " transaction_id TEXT, timestamp TEXT, amount REAL,"
+                " sender TEXT, receiver TEXT, purpose TEXT, decision TEXT,"
+                " sender_key TEXT, receiver_key TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sender ON transactions (sender_key)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_receiver ON transactions (receiver_key)")
+
+    def recall(self, transaction_data: Dict[str, Any], limit: int = 5) -> List[Dict[str, Any]]:
+        """Most recent transactions sharing a sender or receiver with this one"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT transaction_id, timestamp, amount, sender, receiver, purpose, decision"
+                " FROM transactions WHERE receiver_key = ? OR sender_key = ?"
+                " ORDER BY timestamp DESC LIMIT ?",
+                (
+                    str(transaction_data.get("receiver", "")).strip().lower(),
+                    str(transaction_data.get("sender", "")).strip().lower(),
+                    limit,
+                )
+            ).fetchall()
+        columns = ("transaction_id", "timestamp", "amount", "sender", "receiver", "purpose", "decision")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def record(self, transaction_data: Dict[str, Any], decision_output: str) -> None:
+        """Store a processed transaction with the decision it received"""
+        decision = _parse_decision(decision_output)
+        sender = str(transaction_data.get("sender", ""))
+        receiver = str(transaction_data.get("receiver", ""))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    transaction_data.get("transaction_id", "TXN-001"),
+                    transaction_data.get("timestamp", ""),
+                    float(transaction_data.get("amount", 0)),
+                    sender,
+                    receiver,
+                    transaction_data.get("purpose", ""),
+                    decision,
+                    sender.strip().lower(),
+                    receiver.strip().lower(),
+                )
+            )
+
+    def standing(self, transaction_data: Dict[str, Any], limit: int = 5) -> str:
+        """
+        The receiver's recent record as the sender_history risk input:
+        "unknown" with no record, "flagged" if any was rejected or
+        escalated, otherwise "established". Only the external counterparty
+        counts; senders are internal departments, and one rejected payment
+        mustn't flag a department's payments to everyone else.
+        """
+        with self._lock:
+            decisions = [
+                decision for decision, in self._conn.execute(
+                    "SELECT decision FROM transactions WHERE receiver_key = ?"
+                    " ORDER BY timestamp DESC LIMIT ?",
+                    (str(transaction_data.get("receiver", "")).strip().lower(), limit)
+                )
+            ]
+        if not decisions:
+            return "unknown"
+        if not _ADVERSE_DECISIONS.isdisjoint(decisions):
+            return "flagged"
+        return "established"
+
+    @staticmethod
+    def format_history(rows: List[Dict[str, Any]]) -> str:
+        """Render recalled transactions as the {history} task input"""
+        if not rows:
+            return "No prior transactions on record"
+        return "\n".join(
+            f"- {row['timestamp']}: £{row['amount']:,.2f} {row['sender']} → {row['receiver']} "
+            f"({row['purpose']}) [{row['decision']}]"
+            for row in rows
+        )
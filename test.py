@@ -1,76 +1,304 @@
-from crewai import Agent, Task, Crew, Process
 from langchain_groq import ChatGroq
+from langchain_core.caches import InMemoryCache
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from pydantic import ConfigDict, create_model
+from tool import (
+    IntentAnalysisTool,
+    RiskAssessmentTool,
+    PolicyValidationTool,
+    LiquidityCheckTool,
+    AuditLogTool,
+    SPENDING_LIMITS,
+    URGENCY_LEVELS
+)
+from typing import Literal
+import asyncio
+import functools
+import httpx
+import orjson
 import os
+import re
+import threading
 
 load_dotenv()
 
-def process_transaction(transaction_data):
-    print("\n🤖 AI Treasury System Starting...")
+class CountingLLMCache(InMemoryCache):
+    """In-memory LLM response cache that counts hits and misses"""
+    
+    def __init__(self, maxsize=None):
+        super().__init__(maxsize=maxsize)
+        self.stats = {"hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
     
-    llm = ChatGroq(
-        temperature=0.7,
+    def lookup(self, prompt, llm_string):
+        result = super().lookup(prompt, llm_string)
+        with self._stats_lock:
+            self.stats["hits" if result is not None else "misses"] += 1
+        return result
+
+# Keyed on the prompt plus the model's parameters (model name, temperature),
+# so replayed or retried transactions skip the Groq round-trip entirely
+LLM_CACHE = CountingLLMCache(maxsize=1024)
+
+# Keep-alive pool sized for a full batch of concurrent transactions; HTTP/2
+# multiplexes their requests over a few TLS connections to Groq
+GROQ_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100, keepalive_expiry=60.0)
+
+@functools.lru_cache(maxsize=1)
+def get_llm():
+    """Groq LLM shared across transactions so its HTTP session is reused"""
+    # Deterministic sampling: treasury decisions shouldn't vary between
+    # identical requests, and it makes cached responses safe to reuse
+    return ChatGroq(
+        temperature=0.0,
         groq_api_key=os.getenv("GROQ_API_KEY"),
-        model_name="llama-3.3-70b-versatile"
+        model_name="llama-3.3-70b-versatile",
+        cache=LLM_CACHE,
+        http_client=httpx.Client(http2=True, limits=GROQ_LIMITS),
+        http_async_client=httpx.AsyncClient(http2=True, limits=GROQ_LIMITS)
     )
-    
-    intent_agent = Agent(
-        role="Intent Analyst",
-        goal="Analyze transaction",
-        backstory="Transaction expert",
-        verbose=True,
-        llm=llm
+
+# Exposed to the model under function-call-safe names
+ANALYSIS_TOOLS = {
+    "intent_analysis": IntentAnalysisTool(),
+    "risk_assessment": RiskAssessmentTool(),
+    "policy_validation": PolicyValidationTool(),
+    "liquidity_check": LiquidityCheckTool()
+}
+AUDIT_TOOL = AuditLogTool()
+
+# The only arguments the model chooses; amount, counterparties, timestamp
+# and the rest are facts of the transaction, filled in from transaction_data
+MODEL_ARGS = {
+    "intent_analysis": (),
+    "risk_assessment": ("intent",),
+    "policy_validation": ("intent", "urgency"),
+    "liquidity_check": ("intent",)
+}
+
+# The model fills these in during the turn that requests intent_analysis, so
+# it never sees the tool's labels; closed sets keep it from inventing labels
+# like "vendor_payment" that would fall through to the general spending limit
+MODEL_ARG_TYPES = {
+    "intent": Literal[tuple(SPENDING_LIMITS)],
+    "urgency": Literal[URGENCY_LEVELS]
+}
+
+def _model_args_schema(name, tool):
+    """The part of a tool's args_schema the model may fill in"""
+    fields = tool.args_schema.model_fields
+    return create_model(
+        f"{tool.args_schema.__name__}ModelArgs",
+        __config__=ConfigDict(frozen=True, extra="forbid"),
+        **{
+            field: (MODEL_ARG_TYPES.get(field, fields[field].annotation), fields[field])
+            for field in MODEL_ARGS[name]
+        }
     )
+
+MODEL_ARGS_SCHEMAS = {name: _model_args_schema(name, tool) for name, tool in ANALYSIS_TOOLS.items()}
+
+SYSTEM_PROMPT = (
+    "You are the treasury controller for a corporate payments desk. "
+    "First call intent_analysis, risk_assessment, policy_validation and "
+    "liquidity_check together in a single turn. The tools already have the "
+    "transaction's details; where a tool asks for intent or urgency, give your "
+    "own reading of the transaction. Once the tool results are in, reply with "
+    "APPROVE, REJECT or ESCALATE alone on the first line, followed by your reasoning."
+)
+
+# The verdict must lead the first line; markdown emphasis around it is allowed
+_DECISION_PATTERN = re.compile(r"\W*(APPROVE|REJECT|ESCALATE)\b")
+
+# Risk score at which a transaction is rejected without asking the model
+REJECT_RISK_SCORE = 0.75
+
+# Caps blocking Groq requests in flight across all threads, below the rate limit
+GROQ_SLOTS = threading.BoundedSemaphore(int(os.getenv("GROQ_MAX_IN_FLIGHT", "16")))
+
+@functools.lru_cache(maxsize=1)
+def get_agent():
+    """Groq LLM bound to the analysis tools, so one turn can request all of them"""
+    tools = [
+        StructuredTool.from_function(
+            func=tool._run,
+            name=name,
+            description=tool.description,
+            args_schema=MODEL_ARGS_SCHEMAS[name]
+        )
+        for name, tool in ANALYSIS_TOOLS.items()
+    ]
+    return get_llm().bind_tools(tools)
+
+def _transaction_facts(name, transaction_data):
+    """The tool's non-model arguments, taken from the transaction itself"""
+    return {
+        field: transaction_data[field]
+        for field in ANALYSIS_TOOLS[name].args_schema.model_fields
+        if field in transaction_data and field not in MODEL_ARGS[name]
+    }
+
+def _run_tool_call(tool_call, transaction_data):
+    """
+    Execute one requested tool call and wrap its output for the model.
+    The model's arguments and the merged call are both validated against
+    the tool schemas, so invented facts or extra fields are rejected.
+    """
+    name = tool_call["name"]
+    tool = ANALYSIS_TOOLS.get(name)
+    try:
+        if tool is None:
+            raise ValueError(f"Unknown tool: {name}")
+        model_args = MODEL_ARGS_SCHEMAS[name].model_validate(tool_call["args"]).model_dump()
+        args = tool.args_schema.model_validate({**_transaction_facts(name, transaction_data), **model_args})
+        content = tool._run(**args.model_dump())
+    except Exception as e:
+        content = f"Tool error: {e}"
+    return ToolMessage(content=content, tool_call_id=tool_call["id"], name=name)
+
+def _tool_result(tool_messages, name):
+    """Parsed JSON output of the named tool, or {} if it didn't run or failed"""
+    for message in tool_messages:
+        if message.name == name:
+            try:
+                return orjson.loads(message.content)
+            except orjson.JSONDecodeError:
+                return {}
+    return {}
+
+def _forced_rejection(tool_messages):
+    """Reason a transaction must be rejected whatever the model says, or None"""
+    risk = _tool_result(tool_messages, "risk_assessment")
+    if risk.get("risk_score", 0) >= REJECT_RISK_SCORE:
+        return f"Risk score {risk['risk_score']} is at or above {REJECT_RISK_SCORE}"
+    policy = _tool_result(tool_messages, "policy_validation")
+    if policy.get("policy_passed") is False:
+        blocked = [v for v in policy.get("violations", []) if "blocked" in v.lower()]
+        if blocked:
+            return "; ".join(blocked)
+    return None
+
+def _transaction_turns(transaction_data):
+    """
+    The turn logic shared by the sync and async drivers, as a generator.
+    It yields ("invoke", messages) when it needs a Groq reply and
+    ("tools", tool_calls) when it needs tool results, is sent each result
+    back, and returns the rationale once the audit record is written.
+    """
+    print("\n🤖 AI Treasury System Starting...")
     
-    risk_agent = Agent(
-        role="Risk Officer",
-        goal="Assess risk",
-        backstory="Risk expert",
-        verbose=True,
-        llm=llm
-    )
+    messages = [
+        SystemMessage(content=SYSTEM_PROMPT),
+        HumanMessage(content=f"Transaction: {transaction_data}")
+    ]
     
-    decision_agent = Agent(
-        role="CFO",
-        goal="Final decision",
-        backstory="Decision maker",
-        verbose=True,
-        llm=llm
-    )
+    # Turn 1: the model requests every analysis tool at once, instead of
+    # separate agents each making their own LLM call
+    response = yield "invoke", messages
+    messages.append(response)
+    tool_messages = yield "tools", response.tool_calls
+    messages.extend(tool_messages)
     
-    intent_task = Task(
-        description=f"Analyze: {transaction_data}",
-        expected_output="Intent analysis",
-        agent=intent_agent
-    )
+    # A clear rejection from risk or policy settles the outcome, so the
+    # decision turn is skipped
+    rejection = _forced_rejection(tool_messages)
+    if rejection is not None:
+        verdict = "REJECT"
+        rationale = orjson.dumps({"decision": verdict, "reason": rejection}).decode()
+    else:
+        # Turn 2: the decision, synthesised from the tool results
+        decision = (yield "invoke", messages) if tool_messages else response
+        lines = decision.content.strip().splitlines()
+        match = _DECISION_PATTERN.match(lines[0].upper()) if lines else None
+        verdict = match.group(1) if match else "ESCALATE"
+        rationale = decision.content
     
-    risk_task = Task(
-        description=f"Risk check: {transaction_data}",
-        expected_output="Risk score",
-        agent=risk_agent
+    # The audit record needs no reasoning, so it's written directly
+    AUDIT_TOOL._run(
+        transaction_id=transaction_data.get("transaction_id", "TXN-001"),
+        decision=verdict,
+        agent_outputs=orjson.dumps({m.name: m.content for m in tool_messages}).decode(),
+        rationale=rationale
     )
     
-    decision_task = Task(
-        description="APPROVE or DENY decision",
-        expected_output="Final decision",
-        agent=decision_agent
-    )
+    return rationale
+
+async def process_transaction_async(transaction_data):
+    """Run one transaction on the event loop, awaiting Groq instead of blocking a thread"""
+    agent = get_agent()
+    turns = _transaction_turns(transaction_data)
+    result = None
+    try:
+        while True:
+            step, payload = turns.send(result)
+            if step == "invoke":
+                result = await agent.ainvoke(payload)
+            else:
+                result = await asyncio.gather(
+                    *(asyncio.to_thread(_run_tool_call, tool_call, transaction_data) for tool_call in payload)
+                )
+    except StopIteration as finished:
+        return finished.value
+
+async def process_transactions_async(transactions, max_concurrent=16):
+    """
+    Process a batch of transactions on one event loop
     
-    crew = Crew(
-        agents=[intent_agent, risk_agent, decision_agent],
-        tasks=[intent_task, risk_task, decision_task],
-        verbose=True,
-        process=Process.sequential
-    )
+    At most max_concurrent transactions are in flight at once, to stay
+    within Groq rate limits. Results are returned in input order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    
+    async def _bounded(transaction_data):
+        async with semaphore:
+            return await process_transaction_async(transaction_data)
+    
+    return await asyncio.gather(*(_bounded(txn) for txn in transactions))
+
+def process_transaction(transaction_data):
+    """
+    Blocking version of process_transaction_async, safe to call from many
+    threads at once: it uses the pooled sync client and no event loop
+    """
+    agent = get_agent()
+    turns = _transaction_turns(transaction_data)
+    result = None
+    try:
+        while True:
+            step, payload = turns.send(result)
+            if step == "invoke":
+                # Hold one of the GROQ_SLOTS while the request is in flight
+                with GROQ_SLOTS:
+                    result = agent.invoke(payload)
+            else:
+                # Tools are microseconds of pure Python, so they run inline here
+                result = [_run_tool_call(tool_call, transaction_data) for tool_call in payload]
+    except StopIteration as finished:
+        return finished.value
+
+def run_batch(transactions, max_workers=32):
+    """
+    Process a batch of transactions on a thread pool
     
-    return crew.kickoff()
+    Groq calls are network-bound and release the GIL, so throughput grows
+    with max_workers until GROQ_SLOTS or the Groq rate limit is reached.
+    Results are returned in input order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(process_transaction, transactions))
 
 if __name__ == "__main__":
     transaction = {
+        "transaction_id": "TXN-TEST-001",
         "amount": 7500.00,
+        "sender": "Finance Manager",
         "receiver": "Acme Supplies",
         "purpose": "Monthly payment",
         "balance": 125000.00,
+        "timestamp": "2026-01-05T10:30:00",
     }
     
     print("="*60)
@@ -81,4 +309,5 @@ if __name__ == "__main__":
     
     print("\n"+"="*60)
     print("RESULT:", result)
+    print("LLM CACHE:", LLM_CACHE.stats)
     print("="*60)
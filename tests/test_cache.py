@@ -0,0 +1,26 @@
+from cache import TransactionCache
+
+
+def _transaction():
+    return {
+        "sender": "Company Operations",
+        "receiver": "Acme Supplies",
+        "amount": 900,
+        "purpose": "Gift card top-up",
+        "timestamp": "2026-01-05T10:00:00",
+    }
+
+
+def test_downstream_keys_follow_the_intent_result():
+    cache = TransactionCache()
+    transaction = _transaction()
+    vendor = '{"intent": "vendor_payment", "urgency": "low"}'
+    cache.set(TransactionCache.make_key("risk", transaction, vendor), "risk built on vendor")
+
+    assert cache.get(TransactionCache.make_key("risk", transaction, vendor)) == "risk built on vendor"
+    suspicious = '{"intent": "suspicious", "urgency": "low", "red_flags": ["gift cards"]}'
+    assert cache.get(TransactionCache.make_key("risk", transaction, suspicious)) is None
+    assert (
+        TransactionCache.make_key("policy", transaction, "Looks like a vendor payment")
+        != TransactionCache.make_key("policy", transaction, "Looks suspicious")
+    )
@@ -0,0 +1,73 @@
+import orjson
+
+from fastpath import fast_paths
+from memory import TransactionMemory
+from tool import SPENDING_LIMITS
+
+
+def _transaction():
+    return {
+        "transaction_id": "TXN-001",
+        "amount": 900,
+        "sender": "Finance Team",
+        "receiver": "Acme Supplies",
+        "purpose": "Vendor payment invoice 12",
+        "timestamp": "2026-01-05T10:00:00",
+    }
+
+
+def test_prior_rejection_skips_risk_and_decision_fast_paths():
+    memory = TransactionMemory()
+    memory.record(_transaction(), '{"decision": "reject"}')
+
+    transaction = _transaction()
+    transaction["sender_history"] = memory.standing(transaction)
+    assert transaction["sender_history"] == "flagged"
+
+    results = {stage: fast_paths.resolve(stage, transaction, {}) for stage in ("intent", "treasury")}
+    results["policy"] = fast_paths.resolve("policy", transaction, results)
+    assert results["policy"] is not None
+    assert fast_paths.resolve("risk", transaction, results) is None
+
+    results["risk"] = '{"risk_level": "low"}'
+    assert fast_paths.resolve("decision", transaction, results) is None
+
+
+def _agent_intent(intent, red_flags=()):
+    return orjson.dumps({"intent": intent, "urgency": "medium", "red_flags": list(red_flags)}).decode()
+
+
+def _green_results(transaction):
+    results = {"intent": _agent_intent("vendor_payment")}
+    for stage in ("risk", "policy", "treasury"):
+        results[stage] = fast_paths.resolve(stage, transaction, results)
+        assert results[stage] is not None
+    return results
+
+
+def test_agent_intent_labels_map_onto_tool_intents():
+    transaction = _transaction()
+    transaction["amount"] = 7500
+    results = {"intent": _agent_intent("vendor_payment")}
+    policy = orjson.loads(fast_paths.resolve("policy", transaction, results))
+    assert policy["applicable_limit"] == SPENDING_LIMITS["vendor"]
+
+    for label in ("suspicious", "transfer"):
+        results = {"intent": _agent_intent(label)}
+        assert fast_paths.resolve("risk", transaction, results) is None
+        assert fast_paths.resolve("policy", transaction, results) is None
+
+
+def test_decision_fast_path_declines_suspicious_intent_or_red_flags():
+    transaction = _transaction()
+    results = _green_results(transaction)
+    assert fast_paths.resolve("decision", transaction, results) is not None
+
+    for intent in (
+        _agent_intent("suspicious", ["gift card top-up to an unfamiliar receiver"]),
+        _agent_intent("vendor_payment", ["purpose does not match receiver"]),
+        _agent_intent("general"),
+        "not json",
+    ):
+        results["intent"] = intent
+        assert fast_paths.resolve("decision", transaction, results) is None
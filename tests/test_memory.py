@@ -0,0 +1,37 @@
+from memory import TransactionMemory
+
+
+def _transaction():
+    return {
+        "transaction_id": "TXN-001",
+        "amount": 900,
+        "sender": "Company Operations",
+        "receiver": "Acme Supplies",
+        "purpose": "Vendor payment invoice 12",
+        "timestamp": "2026-01-05T10:00:00",
+    }
+
+
+def test_record_prefers_the_structured_decision_field():
+    memory = TransactionMemory()
+    memory.record(_transaction(), '{"reasoning": "cannot approve this payment", "decision": "REJECT"}')
+    assert memory.recall(_transaction())[0]["decision"] == "reject"
+
+
+def test_record_falls_back_to_free_text():
+    memory = TransactionMemory()
+    memory.record(_transaction(), "ESCALATE - amount needs a second signature")
+    assert memory.recall(_transaction())[0]["decision"] == "escalate"
+
+
+def test_standing_follows_the_receiver_only():
+    memory = TransactionMemory()
+    assert memory.standing(_transaction()) == "unknown"
+
+    memory.record(_transaction(), '{"decision": "reject"}')
+    assert memory.standing(_transaction()) == "flagged"
+
+    other_receiver = {**_transaction(), "receiver": "Globex Logistics"}
+    assert memory.standing(other_receiver) == "unknown"
+    memory.record(other_receiver, '{"decision": "approve"}')
+    assert memory.standing(other_receiver) == "established"
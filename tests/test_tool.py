@@ -0,0 +1,89 @@
+import orjson
+
+from fastpath import fast_paths
+from tool import IntentAnalysisTool, PolicyValidationTool, RiskAssessmentTool
+
+
+def _intent(purpose, amount=900):
+    return orjson.loads(IntentAnalysisTool()._run(
+        amount=amount,
+        sender="Finance Team",
+        receiver="Acme Supplies",
+        purpose=purpose,
+        timestamp="2026-01-05T10:00:00"
+    ))
+
+
+def _policy(receiver):
+    return orjson.loads(PolicyValidationTool()._run(
+        amount=900,
+        intent="vendor",
+        sender="Finance Team",
+        receiver=receiver,
+        urgency="medium"
+    ))
+
+
+def _risk(receiver):
+    return orjson.loads(RiskAssessmentTool()._run(
+        amount=900,
+        sender="Finance Team",
+        receiver=receiver,
+        intent="vendor",
+        timestamp="2026-01-05T10:00:00",
+        sender_history="established"
+    ))
+
+
+def test_intent_matches_whole_words_and_plurals():
+    assert _intent("Refunds batch")["intent"] == "refund"
+    assert _intent("Quarterly taxes")["intent"] == "tax"
+    assert _intent("Taxi fares")["intent"] == "general"
+
+
+def test_urgency_keywords_match_adverb_forms():
+    for purpose in ("Settle invoice immediately", "Supplier urgently needs payment", "Critically overdue invoice"):
+        assert _intent(purpose, amount=5000)["urgency"] == "high"
+    assert _intent("Release funds urgently", amount=5000)["intent"] == "emergency"
+    assert _intent("Immediateness of supplier invoice", amount=5000)["urgency"] == "medium"
+
+
+def test_blocked_receiver_matches_inside_longer_words():
+    for receiver in ("Blacklisted Holdings", "SanctionedCo", "Blocked Ltd"):
+        policy = _policy(receiver)
+        assert not policy["policy_passed"]
+        assert "Receiver is on blocked/sanctioned list" in policy["violations"]
+
+
+def test_suspicious_receiver_matches_inside_longer_words():
+    for receiver in ("Temporary Acct", "testing ltd"):
+        assert "suspicious_receiver" in _risk(receiver)["risk_factors"]
+
+
+def test_blacklisted_receiver_skips_policy_fast_path():
+    transaction = {
+        "amount": 900,
+        "sender": "Finance Team",
+        "receiver": "Blacklisted Holdings Ltd",
+        "purpose": "Vendor payment invoice 12",
+        "timestamp": "2026-01-05T10:00:00",
+    }
+    results = {"intent": IntentAnalysisTool()._run(
+        amount=900,
+        sender=transaction["sender"],
+        receiver=transaction["receiver"],
+        purpose=transaction["purpose"],
+        timestamp=transaction["timestamp"]
+    )}
+    assert fast_paths.resolve("policy", transaction, results) is None
+
+
+def test_approver_fragments_in_sender_name():
+    policy = orjson.loads(PolicyValidationTool()._run(
+        amount=20000,
+        intent="vendor",
+        sender="Pre-approved Managers Desk",
+        receiver="Acme Supplies",
+        urgency="medium"
+    ))
+    assert "Requires management pre-approval for amounts over £10,000" not in policy["violations"]
@@ -1,16 +1,101 @@
 from crewai_tools import BaseTool
-from typing import Type, Dict, Any, List
-from pydantic import BaseModel, Field
-import json
+from typing import TYPE_CHECKING, Type, Dict, Any, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
+import bisect
+import blake3
+import functools
+import logging
+import orjson
+import re
 from datetime import datetime
+from types import MappingProxyType
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _alternation(keywords) -> str:
+    """Regex alternation over keywords, longest first"""
+    return "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+
+
+def _word_pattern(keywords, adverbs: bool = False) -> "re.Pattern[str]":
+    """
+    Match lowercase keywords as whole words, allowing a simple "s"/"es"
+    plural and, with adverbs, an "ly" form; group 1 is the keyword itself.
+    "tax" matches "taxes" but not "taxi"; "urgent" matches "urgently"
+    """
+    suffix = r"(?:e?s|ly)?" if adverbs else r"(?:e?s)?"
+    return re.compile(r"(?<![a-z])(" + _alternation(keywords) + r")" + suffix + r"(?![a-z])")
+
+
+def _fragment_pattern(keywords) -> "re.Pattern[str]":
+    """Match lowercase keywords anywhere, including inside longer words"""
+    return re.compile(_alternation(keywords))
+
+
+def _tier(thresholds: Tuple[float, ...], amount: float) -> int:
+    """Number of sorted thresholds the amount strictly exceeds"""
+    return bisect.bisect_left(thresholds, amount)
+
+
+def _to_json(result: Dict[str, Any]) -> str:
+    """Serialize a tool result as compact JSON with stable key order"""
+    # No indentation: tool outputs are fed back to the LLM, where
+    # whitespace only adds prompt tokens
+    return orjson.dumps(result, option=orjson.OPT_SORT_KEYS).decode()
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_timestamp(timestamp: str) -> Optional[datetime]:
+    """Parse an ISO timestamp once for every tool that sees it, or None if invalid"""
+    try:
+        return datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
 
 
 # ============================================
 # 1. INTENT ANALYSIS TOOL
 # ============================================
 
+# Purpose keywords per intent, in priority order
+INTENT_KEYWORDS = MappingProxyType({
+    "refund": frozenset({"refund", "return", "reimbursement", "reversal"}),
+    "payroll": frozenset({"salary", "wage", "payroll", "compensation", "bonus"}),
+    "vendor": frozenset({"vendor", "supplier", "invoice", "payment", "purchase"}),
+    "investment": frozenset({"investment", "equity", "acquisition", "stake"}),
+    "emergency": frozenset({"urgent", "emergency", "critical", "immediate"}),
+    "tax": frozenset({"tax", "vat", "hmrc", "duty"}),
+    "loan": frozenset({"loan", "credit", "financing", "borrowing"})
+})
+
+URGENCY_KEYWORDS = frozenset({"urgent", "emergency", "immediate", "asap", "critical"})
+
+# Urgency levels the intent tool assigns and the policy tool understands
+URGENCY_LEVELS = ("low", "medium", "high")
+
+KW_TO_INTENT = MappingProxyType(
+    {kw: intent for intent, keywords in INTENT_KEYWORDS.items() for kw in keywords}
+)
+INTENT_PRIORITY = MappingProxyType({intent: rank for rank, intent in enumerate(INTENT_KEYWORDS)})
+
+
+# "Pay immediately" / "urgently needed": the urgency and emergency keywords
+# are mostly written as adverbs, and no other keyword has an "ly" form
+INTENT_RE = _word_pattern(KW_TO_INTENT, adverbs=True)
+URGENCY_RE = _word_pattern(URGENCY_KEYWORDS, adverbs=True)
+
+AMOUNT_CATEGORY_THRESHOLDS = (5000, 25000)
+AMOUNT_CATEGORIES = ("low", "medium", "high")
+
+
 class IntentAnalysisInput(BaseModel):
     """Input schema for Intent Analysis Tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     amount: float = Field(..., description="Transaction amount in GBP")
     sender: str = Field(..., description="Sender identifier or name")
     receiver: str = Field(..., description="Receiver identifier or name")
@@ -38,32 +123,19 @@ class IntentAnalysisTool(BaseTool):
     ) -> str:
         """Execute intent analysis and return JSON string"""
         
-        # Intent classification logic
-        intent_keywords = {
-            "refund": ["refund", "return", "reimbursement", "reversal"],
-            "payroll": ["salary", "wage", "payroll", "compensation", "bonus"],
-            "vendor": ["vendor", "supplier", "invoice", "payment", "purchase"],
-            "investment": ["investment", "equity", "acquisition", "stake"],
-            "emergency": ["urgent", "emergency", "critical", "immediate"],
-            "tax": ["tax", "vat", "hmrc", "duty"],
-            "loan": ["loan", "credit", "financing", "borrowing"]
-        }
-        
         purpose_lower = purpose.lower()
         detected_intent = "general"
         matched_keywords = []
         
-        # Find matching intent
-        for intent_type, keywords in intent_keywords.items():
-            matches = [kw for kw in keywords if kw in purpose_lower]
-            if matches:
-                detected_intent = intent_type
-                matched_keywords = matches
-                break
+        # Find matching intent: one scan finds every keyword, and the
+        # highest-priority intent among them wins
+        hits = set(INTENT_RE.findall(purpose_lower))
+        if hits:
+            detected_intent = min((KW_TO_INTENT[kw] for kw in hits), key=INTENT_PRIORITY.__getitem__)
+            matched_keywords = sorted(kw for kw in hits if KW_TO_INTENT[kw] == detected_intent)
         
         # Determine urgency
-        urgency_keywords = ["urgent", "emergency", "immediate", "asap", "critical"]
-        urgency = "high" if any(kw in purpose_lower for kw in urgency_keywords) else "medium"
+        urgency = "high" if URGENCY_RE.search(purpose_lower) else "medium"
         
         # Adjust urgency based on amount
         if amount > 50000:
@@ -77,12 +149,8 @@ class IntentAnalysisTool(BaseTool):
             confidence = 0.50
         
         # Check timing
-        try:
-            tx_time = datetime.fromisoformat(timestamp)
-            hour = tx_time.hour
-            is_off_hours = hour < 6 or hour > 22
-        except:
-            is_off_hours = False
+        tx_time = _parse_timestamp(timestamp)
+        is_off_hours = tx_time is not None and (tx_time.hour < 6 or tx_time.hour > 22)
         
         result = {
             "intent": detected_intent,
@@ -90,13 +158,13 @@ class IntentAnalysisTool(BaseTool):
             "confidence": round(confidence, 2),
             "matched_keywords": matched_keywords,
             "is_off_hours": is_off_hours,
-            "amount_category": "high" if amount > 25000 else "medium" if amount > 5000 else "low",
+            "amount_category": AMOUNT_CATEGORIES[_tier(AMOUNT_CATEGORY_THRESHOLDS, amount)],
             "analysis_timestamp": datetime.now().isoformat(),
             "reasoning": f"Classified as '{detected_intent}' based on keywords: {matched_keywords}. "
                         f"Urgency: {urgency} due to amount (£{amount:,.2f}) and purpose."
         }
         
-        return json.dumps(result, indent=2)
+        return _to_json(result)
 
 
 # ============================================
@@ -105,6 +173,8 @@ class IntentAnalysisTool(BaseTool):
 
 class RiskAssessmentInput(BaseModel):
     """Input schema for Risk Assessment Tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     amount: float = Field(..., description="Transaction amount in GBP")
     sender: str = Field(..., description="Sender identifier")
     receiver: str = Field(..., description="Receiver identifier")
@@ -113,6 +183,35 @@ class RiskAssessmentInput(BaseModel):
     sender_history: str = Field(default="unknown", description="Sender's transaction history")
 
 
+# Amount tiers with the risk each one adds
+AMOUNT_RISK_THRESHOLDS = (25000, 50000, 100000)
+AMOUNT_RISK_DELTAS = (0.0, 0.08, 0.15, 0.25)
+AMOUNT_RISK_FACTORS = (None, "elevated_amount", "high_amount", "very_high_amount")
+
+# Risk each remaining signal adds; batch_score weighs its columns with these too
+OFF_HOURS_RISK = 0.12
+WEEKEND_RISK = 0.08
+INVALID_TIMESTAMP_RISK = 0.05
+SUSPICIOUS_RECEIVER_RISK = 0.20
+UNKNOWN_HISTORY_RISK = 0.10
+NEW_SENDER_RISK = 0.08
+HIGH_RISK_INTENT_RISK = 0.10
+ROUND_AMOUNT_RISK = 0.05
+
+# Receiver name fragments associated with mule or throwaway accounts,
+# matched anywhere in the name ("Temporary Acct", "testing ltd")
+SUSPICIOUS_RECEIVER_PATTERNS = frozenset({"unknown", "temp", "test", "cash", "personal"})
+
+# Intents that carry extra risk on their own
+HIGH_RISK_INTENTS = frozenset({"emergency", "general", "loan"})
+
+SUSPICIOUS_RE = _fragment_pattern(SUSPICIOUS_RECEIVER_PATTERNS)
+
+# Risk score at which each level above "low" starts
+RISK_LEVEL_THRESHOLDS = (0.25, 0.50, 0.75)
+RISK_LEVELS = ("low", "medium", "high", "critical")
+
+
 class RiskAssessmentTool(BaseTool):
     name: str = "Fraud Risk Assessment Tool"
     description: str = (
@@ -136,73 +235,59 @@ class RiskAssessmentTool(BaseTool):
         risk_factors = []
         
         # 1. Amount-based risk
-        if amount > 100000:
-            risk_score += 0.25
-            risk_factors.append("very_high_amount")
-        elif amount > 50000:
-            risk_score += 0.15
-            risk_factors.append("high_amount")
-        elif amount > 25000:
-            risk_score += 0.08
-            risk_factors.append("elevated_amount")
+        tier = _tier(AMOUNT_RISK_THRESHOLDS, amount)
+        if tier:
+            risk_score += AMOUNT_RISK_DELTAS[tier]
+            risk_factors.append(AMOUNT_RISK_FACTORS[tier])
         
         # 2. Time-based risk
-        try:
-            tx_time = datetime.fromisoformat(timestamp)
+        tx_time = _parse_timestamp(timestamp)
+        if tx_time is not None:
             hour = tx_time.hour
             day_of_week = tx_time.weekday()  # 0=Monday, 6=Sunday
             
             # Off-hours transactions
             if hour < 6 or hour > 22:
-                risk_score += 0.12
+                risk_score += OFF_HOURS_RISK
                 risk_factors.append("off_hours_transaction")
             
             # Weekend transactions
             if day_of_week >= 5:  # Saturday or Sunday
-                risk_score += 0.08
+                risk_score += WEEKEND_RISK
                 risk_factors.append("weekend_transaction")
-        except:
-            risk_score += 0.05
+        else:
+            risk_score += INVALID_TIMESTAMP_RISK
             risk_factors.append("invalid_timestamp")
         
         # 3. Receiver risk
-        receiver_lower = receiver.lower()
-        suspicious_patterns = ["unknown", "temp", "test", "cash", "personal"]
-        if any(pattern in receiver_lower for pattern in suspicious_patterns):
-            risk_score += 0.20
+        if SUSPICIOUS_RE.search(receiver.lower()):
+            risk_score += SUSPICIOUS_RECEIVER_RISK
             risk_factors.append("suspicious_receiver")
         
         # 4. Sender history risk
-        if sender_history.lower() == "unknown":
-            risk_score += 0.10
+        sender_history_lower = sender_history.lower()
+        if sender_history_lower == "unknown":
+            risk_score += UNKNOWN_HISTORY_RISK
             risk_factors.append("unknown_sender_history")
-        elif "new" in sender_history.lower():
-            risk_score += 0.08
+        elif "new" in sender_history_lower:
+            risk_score += NEW_SENDER_RISK
             risk_factors.append("new_sender")
         
         # 5. Intent-based risk
-        high_risk_intents = ["emergency", "general", "loan"]
-        if intent in high_risk_intents:
-            risk_score += 0.10
+        if intent in HIGH_RISK_INTENTS:
+            risk_score += HIGH_RISK_INTENT_RISK
             risk_factors.append(f"high_risk_intent_{intent}")
         
         # 6. Round number risk (potential structuring)
         if amount % 10000 == 0 and amount >= 10000:
-            risk_score += 0.05
+            risk_score += ROUND_AMOUNT_RISK
             risk_factors.append("suspicious_round_amount")
         
         # Cap risk score at 1.0
         risk_score = min(risk_score, 1.0)
         
         # Determine risk level
-        if risk_score < 0.25:
-            risk_level = "low"
-        elif risk_score < 0.50:
-            risk_level = "medium"
-        elif risk_score < 0.75:
-            risk_level = "high"
-        else:
-            risk_level = "critical"
+        risk_level = RISK_LEVELS[bisect.bisect_right(RISK_LEVEL_THRESHOLDS, risk_score)]
         
         result = {
             "risk_score": round(risk_score, 2),
@@ -219,15 +304,105 @@ class RiskAssessmentTool(BaseTool):
             )
         }
         
-        return json.dumps(result, indent=2)
+        return _to_json(result)
+
+    @classmethod
+    def batch_score(cls, df: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Score many transactions at once with the same rules as _run
+        
+        df needs columns amount, hour, weekday, receiver, sender_history and
+        intent, with hour/weekday NaN where the timestamp didn't parse.
+        Returns risk_score and risk_level columns on the same index.
+        """
+        # Only needed for batch backfills, so not imported with the tools
+        import numpy as np
+        import pandas as pd
+
+        amount = df["amount"].to_numpy(dtype=float)
+        hour = df["hour"].to_numpy(dtype=float)
+        weekday = df["weekday"].to_numpy(dtype=float)
+        history = df["sender_history"].fillna("unknown").astype(str).str.lower()
+        suspicious = df["receiver"].fillna("").astype(str).str.lower().str.contains(
+            SUSPICIOUS_RE, regex=True
+        ).to_numpy()
+
+        amount_tier = np.searchsorted(AMOUNT_RISK_THRESHOLDS, amount, side="left")
+        has_time = ~np.isnan(hour)
+        unknown_history = (history == "unknown").to_numpy()
+
+        indicators = np.column_stack([
+            amount_tier == 1,
+            amount_tier == 2,
+            amount_tier == 3,
+            has_time & ((hour < 6) | (hour > 22)),
+            has_time & (weekday >= 5),
+            ~has_time,
+            suspicious,
+            unknown_history,
+            ~unknown_history & history.str.contains("new", regex=False).to_numpy(),
+            df["intent"].isin(HIGH_RISK_INTENTS).to_numpy(),
+            (amount % 10000 == 0) & (amount >= 10000),
+        ])
+        weights = np.array([
+            *AMOUNT_RISK_DELTAS[1:],
+            OFF_HOURS_RISK,
+            WEEKEND_RISK,
+            INVALID_TIMESTAMP_RISK,
+            SUSPICIOUS_RECEIVER_RISK,
+            UNKNOWN_HISTORY_RISK,
+            NEW_SENDER_RISK,
+            HIGH_RISK_INTENT_RISK,
+            ROUND_AMOUNT_RISK,
+        ])
+
+        # Accumulate column by column, in the order _run adds them, so the
+        # float sums (and so the level boundaries) match _run exactly
+        risk_scores = np.zeros(len(df))
+        for column, weight in zip(indicators.T, weights):
+            risk_scores += column * weight
+        risk_scores = np.minimum(risk_scores, 1.0)
+        levels = np.asarray(RISK_LEVELS)[np.searchsorted(RISK_LEVEL_THRESHOLDS, risk_scores, side="right")]
+        return pd.DataFrame({"risk_score": np.round(risk_scores, 2), "risk_level": levels}, index=df.index)
 
 
 # ============================================
 # 3. POLICY VALIDATION TOOL
 # ============================================
 
+# Spending limits per intent type
+SPENDING_LIMITS = MappingProxyType({
+    "refund": 15000,
+    "vendor": 30000,
+    "payroll": 150000,
+    "investment": 100000,
+    "emergency": 50000,
+    "tax": 200000,
+    "loan": 75000,
+    "general": 5000
+})
+
+# Receiver name fragments that mark a sanctioned or blocked counterparty,
+# matched anywhere in the name ("Blacklisted Holdings", "SanctionedCo")
+BLOCKED_RECEIVER_KEYWORDS = frozenset({"sanctioned", "blacklist", "blocked"})
+
+# Sender name fragments that carry management or director sign-off
+MANAGER_APPROVERS = frozenset({"approved", "manager"})
+DIRECTOR_APPROVERS = frozenset({"director"})
+
+BLOCKED_RE = _fragment_pattern(BLOCKED_RECEIVER_KEYWORDS)
+APPROVER_RE = _fragment_pattern(MANAGER_APPROVERS)
+DIRECTOR_RE = _fragment_pattern(DIRECTOR_APPROVERS)
+
+# Sign-off needed once the amount exceeds each threshold
+APPROVAL_THRESHOLDS = (10000, 50000, 100000)
+APPROVAL_LEVELS = ("standard", "manager", "director", "dual_authorization")
+
+
 class PolicyValidationInput(BaseModel):
     """Input schema for Policy Validation Tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     amount: float = Field(..., description="Transaction amount in GBP")
     intent: str = Field(..., description="Transaction intent classification")
     sender: str = Field(..., description="Sender identifier")
@@ -253,24 +428,12 @@ class PolicyValidationTool(BaseTool):
     ) -> str:
         """Execute policy validation and return JSON string"""
         
-        # Define spending limits per intent type
-        spending_limits = {
-            "refund": 15000,
-            "vendor": 30000,
-            "payroll": 150000,
-            "investment": 100000,
-            "emergency": 50000,
-            "tax": 200000,
-            "loan": 75000,
-            "general": 5000
-        }
-        
         violations = []
         warnings = []
         policy_passed = True
         
         # 1. Check spending limits
-        applicable_limit = spending_limits.get(intent, spending_limits["general"])
+        applicable_limit = SPENDING_LIMITS.get(intent, SPENDING_LIMITS["general"])
         if amount > applicable_limit:
             violations.append(
                 f"Exceeds {intent} spending limit of £{applicable_limit:,.2f} "
@@ -279,13 +442,14 @@ class PolicyValidationTool(BaseTool):
             policy_passed = False
         
         # 2. Check approval requirements
-        if amount > 10000 and "approved" not in sender.lower() and "manager" not in sender.lower():
+        sender_lower = sender.lower()
+        if amount > 10000 and not APPROVER_RE.search(sender_lower):
             violations.append(
                 "Requires management pre-approval for amounts over £10,000"
             )
             policy_passed = False
         
-        if amount > 50000 and "director" not in sender.lower():
+        if amount > 50000 and not DIRECTOR_RE.search(sender_lower):
             violations.append(
                 "Requires director authorization for amounts over £50,000"
             )
@@ -299,9 +463,7 @@ class PolicyValidationTool(BaseTool):
             policy_passed = False
         
         # 4. Receiver validation
-        receiver_lower = receiver.lower()
-        blocked_keywords = ["sanctioned", "blacklist", "blocked"]
-        if any(keyword in receiver_lower for keyword in blocked_keywords):
+        if BLOCKED_RE.search(receiver.lower()):
             violations.append(
                 "Receiver is on blocked/sanctioned list"
             )
@@ -333,27 +495,35 @@ class PolicyValidationTool(BaseTool):
             "warnings": warnings,
             "applicable_limit": applicable_limit,
             "amount_within_limit": amount <= applicable_limit,
-            "approval_level_required": (
-                "dual_authorization" if amount > 100000 else
-                "director" if amount > 50000 else
-                "manager" if amount > 10000 else
-                "standard"
-            ),
+            "approval_level_required": APPROVAL_LEVELS[_tier(APPROVAL_THRESHOLDS, amount)],
             "validation_timestamp": datetime.now().isoformat(),
             "compliance_score": 1.0 if policy_passed and not warnings else 
                                0.7 if policy_passed and warnings else 
                                0.0
         }
         
-        return json.dumps(result, indent=2)
+        return _to_json(result)
 
 
 # ============================================
 # 4. LIQUIDITY CHECK TOOL
 # ============================================
 
+# Simulated account data (in production: query real banking API)
+ACCOUNT_BALANCES = MappingProxyType({
+    "primary": 180000,
+    "reserve": 50000,
+    "payroll": 200000,
+    "operations": 75000
+})
+
+CASH_FLOW_THRESHOLDS = (10000, 50000)
+CASH_FLOW_IMPACTS = ("minimal", "moderate", "significant")
+
 class LiquidityCheckInput(BaseModel):
     """Input schema for Liquidity Check Tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     amount: float = Field(..., description="Transaction amount in GBP")
     account_id: str = Field(default="primary", description="Account identifier")
     intent: str = Field(default="general", description="Transaction intent")
@@ -375,15 +545,7 @@ class LiquidityCheckTool(BaseTool):
     ) -> str:
         """Execute liquidity check and return JSON string"""
         
-        # Simulated account data (in production: query real banking API)
-        account_balances = {
-            "primary": 180000,
-            "reserve": 50000,
-            "payroll": 200000,
-            "operations": 75000
-        }
-        
-        current_balance = account_balances.get(account_id, 150000)
+        current_balance = ACCOUNT_BALANCES.get(account_id, 150000)
         
         # Financial constraints
         minimum_reserve = 25000  # Must maintain this minimum
@@ -423,12 +585,8 @@ class LiquidityCheckTool(BaseTool):
         # Cash flow impact assessment
         if intent == "emergency":
             cash_flow_impact = "high_priority"
-        elif amount > 50000:
-            cash_flow_impact = "significant"
-        elif amount > 10000:
-            cash_flow_impact = "moderate"
         else:
-            cash_flow_impact = "minimal"
+            cash_flow_impact = CASH_FLOW_IMPACTS[_tier(CASH_FLOW_THRESHOLDS, amount)]
         
         # Overall feasibility
         financially_viable = sufficient_funds and within_daily_limit and within_budget
@@ -456,15 +614,26 @@ class LiquidityCheckTool(BaseTool):
             "check_timestamp": datetime.now().isoformat()
         }
         
-        return json.dumps(result, indent=2)
+        return _to_json(result)
 
 
 # ============================================
 # 5. AUDIT LOGGING TOOL
 # ============================================
 
+# agent_outputs keys showing each stage ran: pipeline stage names, or the
+# tool names used by the single-agent demo
+AUDIT_STAGE_KEYS = MappingProxyType({
+    "intent_analysis_completed": frozenset({"intent", "intent_analysis"}),
+    "risk_assessment_completed": frozenset({"risk", "risk_assessment"}),
+    "policy_validation_completed": frozenset({"policy", "policy_validation"}),
+    "liquidity_check_completed": frozenset({"treasury", "liquidity_check"})
+})
+
 class AuditLogInput(BaseModel):
     """Input schema for Audit Logging Tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     transaction_id: str = Field(..., description="Unique transaction identifier")
     decision: str = Field(..., description="Final decision: APPROVE/REJECT/ESCALATE")
     agent_outputs: str = Field(..., description="JSON string of all agent outputs")
@@ -492,24 +661,32 @@ class AuditLogTool(BaseTool):
         
         # Parse agent outputs if it's a JSON string
         try:
-            outputs_dict = json.loads(agent_outputs) if isinstance(agent_outputs, str) else agent_outputs
+            outputs_dict = orjson.loads(agent_outputs) if isinstance(agent_outputs, str) else agent_outputs
         except:
             outputs_dict = {"raw": agent_outputs}
         
+        output_keys = outputs_dict.keys() if isinstance(outputs_dict, dict) else ()
+        record_timestamp = datetime.now().isoformat()
+        
+        # Stream the fields straight into BLAKE3, NUL-separated so field
+        # boundaries are unambiguous; reproducible across processes, unlike
+        # the salted built-in hash()
+        hasher = blake3.blake3()
+        for field in (transaction_id, decision, record_timestamp):
+            hasher.update(field.encode("utf-8"))
+            hasher.update(b"\x00")
+        
         # Create comprehensive audit record
         audit_record = {
             "audit_id": f"AUDIT-{transaction_id}",
             "transaction_id": transaction_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": record_timestamp,
             "decision": decision,
             "decision_maker": decision_maker,
             "rationale": rationale,
             "agent_outputs": outputs_dict,
             "audit_trail": {
-                "intent_analysis_completed": "intent" in str(outputs_dict),
-                "risk_assessment_completed": "risk" in str(outputs_dict),
-                "policy_validation_completed": "policy" in str(outputs_dict),
-                "liquidity_check_completed": "treasury" in str(outputs_dict),
+                **{flag: not keys.isdisjoint(output_keys) for flag, keys in AUDIT_STAGE_KEYS.items()},
                 "final_decision_made": decision in ["APPROVE", "REJECT", "ESCALATE"]
             },
             "compliance_flags": {
@@ -518,23 +695,21 @@ class AuditLogTool(BaseTool):
                 "decision_documented": bool(rationale),
                 "timestamp_recorded": True
             },
-            "verification_hash": hash(json.dumps({
-                "tx_id": transaction_id,
-                "decision": decision,
-                "timestamp": datetime.now().isoformat()
-            }, sort_keys=True))
+            "verification_hash": hasher.hexdigest()
         }
         
         # In production: Write to immutable storage (blockchain, WORM, etc.)
-        # For now: Print to console for visibility
-        print("\n" + "="*70)
-        print("🔒 IMMUTABLE AUDIT RECORD CREATED")
-        print("="*70)
-        print(f"Transaction ID: {transaction_id}")
-        print(f"Decision: {decision}")
-        print(f"Timestamp: {audit_record['timestamp']}")
-        print(f"Verification Hash: {audit_record['verification_hash']}")
-        print("="*70 + "\n")
+        # For now: Log for visibility
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s", "="*70)
+            logger.info("🔒 IMMUTABLE AUDIT RECORD CREATED")
+            logger.info("%s", "="*70)
+            logger.info("Transaction ID: %s", transaction_id)
+            logger.info("Decision: %s", decision)
+            logger.info("Timestamp: %s", audit_record['timestamp'])
+            logger.info("Verification Hash: %s", audit_record['verification_hash'])
+            logger.info("Record: %s", _to_json(audit_record))
+            logger.info("%s", "="*70)
         
         result = {
             "audit_logged": True,
@@ -546,4 +721,4 @@ class AuditLogTool(BaseTool):
             "record_retrievable": True
         }
         
-        return json.dumps(result, indent=2)
+        return _to_json(result)
@@ -0,0 +1,431 @@
+from dotenv import load_dotenv
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+import functools
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import orjson
+import os
+import queue
+from string import Formatter
+from typing import Dict, Any, List, Tuple
+
+# Import stage output cache and deterministic fast paths
+from cache import TransactionCache
+from fastpath import fast_paths, guess_intent, same_intent
+
+# Import shared transaction history
+from memory import TransactionMemory
+
+# Import the parametric task factories (built on first use, filled in per transaction)
+from task import (
+    get_intent_analysis_task,
+    get_risk_assessment_task,
+    get_policy_validation_task,
+    get_liquidity_check_task,
+    get_final_decision_task,
+    get_audit_logging_task
+)
+
+logger = logging.getLogger(__name__)
+
+_BAR = "=" * 60
+
+# Pipeline graph: each stage lists the stages whose output it consumes.
+# Stages with no outstanding dependencies are started together, so risk,
+# policy and liquidity overlap instead of running back to back.
+STAGE_DEPENDENCIES = {
+    "intent": (),
+    "risk": ("intent",),
+    "policy": ("intent",),
+    "treasury": (),
+    "decision": ("intent", "risk", "policy", "treasury"),
+    "audit": ("intent", "risk", "policy", "treasury", "decision"),
+}
+
+def _compile_schedule(dependencies: Dict[str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    """
+    Topologically order the stage graph once at import. A cycle or unknown
+    dependency fails here instead of stalling _run_pipeline at runtime.
+    """
+    order = []
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [stage for stage, deps in remaining.items() if all(dep in order for dep in deps)]
+        if not ready:
+            raise ValueError(f"Unresolvable stage dependencies: {', '.join(sorted(remaining))}")
+        for stage in ready:
+            order.append(stage)
+            del remaining[stage]
+    return tuple(order)
+
+
+STAGE_SCHEDULE = _compile_schedule(STAGE_DEPENDENCIES)
+STAGE_POSITIONS = {stage: position for position, stage in enumerate(STAGE_SCHEDULE, start=1)}
+
+# Stages whose output only depends on the transaction itself and can be
+# reused for repeat-pattern transactions
+CACHEABLE_STAGES = ("intent", "risk", "policy")
+
+# Stages that only need the intent and may start on a keyword-based guess
+# while the intent agent runs; rerun if the final intent disagrees
+SPECULATIVE_STAGES = ("policy",)
+
+# Stages off the decision critical path: they start once the decision is
+# made and are handed back to the caller as a Future
+BACKGROUND_STAGES = ("audit",)
+
+# Each factory builds its task (and the task's agent) once, on first use
+STAGE_TASKS = {
+    "intent": get_intent_analysis_task,
+    "risk": get_risk_assessment_task,
+    "policy": get_policy_validation_task,
+    "treasury": get_liquidity_check_task,
+    "decision": get_final_decision_task,
+    "audit": get_audit_logging_task,
+}
+
+STAGE_LABELS = {
+    "intent": "Intent Analysis",
+    "risk": "Risk Assessment",
+    "policy": "Policy Validation",
+    "treasury": "Liquidity Check",
+    "decision": "Final Decision",
+    "audit": "Audit Record",
+}
+
+
+@functools.cache
+def _stage_input_fields(stage: str) -> frozenset:
+    """
+    Names of the {placeholders} in a stage's task template, parsed once so
+    each execution only builds the inputs its task uses
+    """
+    template = STAGE_TASKS[stage]().description
+    return frozenset(name for _, name, _, _ in Formatter().parse(template) if name)
+
+
+class AITreasurySystem:
+    """
+    Autonomous AI Treasury System
+    
+    Governs monetary actions using specialized AI agents for:
+    - Intent understanding
+    - Risk assessment
+    - Policy validation
+    - Liquidity checking
+    - Final decision making
+    - Audit logging
+    """
+    
+    def __init__(self):
+        load_dotenv()
+        
+        # Max number of independent stages run at once (1 = fully sequential)
+        self.concurrency_limit = max(1, int(os.getenv("TOOL_CONCURRENCY_LIMIT", "1")))
+        
+        # Audit records are written in the background after the decision
+        self._audit_executor = ThreadPoolExecutor(thread_name_prefix="audit")
+        
+        # History of earlier transactions, shared by every stage's agent
+        self.memory = TransactionMemory(os.getenv("TRANSACTION_MEMORY_PATH", ":memory:"))
+        
+        # Reuse intent/risk/policy outputs for repeat-pattern transactions
+        self.cache = TransactionCache(
+            ttl_seconds=float(os.getenv("TRANSACTION_CACHE_TTL", "3600"))
+        )
+        
+        logger.info("✓ AI Treasury System Initialized")
+    
+    def _stage_inputs(self, stage: str, transaction_data: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+        """Build exactly the inputs a stage's task template asks for"""
+        available = {
+            "transaction_id": transaction_data.get("transaction_id", "TXN-001"),
+            "amount": transaction_data.get("amount"),
+            "sender": transaction_data.get("sender", ""),
+            "receiver": transaction_data.get("receiver", ""),
+            "purpose": transaction_data.get("purpose", ""),
+            "timestamp": transaction_data.get("timestamp", ""),
+            "account_id": transaction_data.get("account_id", "primary"),
+            "history": transaction_data.get("history", "No prior transactions on record"),
+        }
+        fields = _stage_input_fields(stage)
+        
+        missing = [
+            field for field in fields
+            if field not in available and field.removesuffix("_output") not in results
+        ]
+        if missing:
+            raise ValueError(f"Stage '{stage}' is missing inputs: {', '.join(sorted(missing))}")
+        
+        return {
+            field: available[field] if field in available else str(results[field.removesuffix("_output")])
+            for field in fields
+        }
+    
+    def _execute(self, stage: str, inputs: Dict[str, Any]) -> str:
+        """
+        Run a stage's task directly on its agent. A one-agent, one-task Crew
+        adds nothing but orchestration overhead; upstream outputs already
+        reach the task through its {*_output} placeholders.
+        
+        The shared task is only a template: each execution interpolates a
+        shallow copy, with its own copy of the agent for executor state, so
+        concurrent transactions run the same stage in parallel.
+        """
+        template = STAGE_TASKS[stage]()
+        agent = template.agent.model_copy()
+        task = template.model_copy(update={"agent": agent})
+        task.interpolate_inputs(inputs)
+        return agent.execute_task(task, tools=task.tools)
+    
+    def _run_stage(
+        self,
+        stage: str,
+        transaction_data: Dict[str, Any],
+        results: Dict[str, Any],
+        use_cache: bool = True
+    ):
+        """
+        Execute a single pipeline stage. Speculative runs pass use_cache=False:
+        they're built on the keyword guess rather than the intent agent's
+        output, so they're neither stored in nor served from the cache.
+        """
+        label = STAGE_LABELS[stage]
+        logger.debug(
+            "[%d/%d] %s...",
+            STAGE_POSITIONS[stage], len(STAGE_SCHEDULE), label
+        )
+        
+        # Routine cases are decided in code; the agent is the fallback
+        fast_result = fast_paths.resolve(stage, transaction_data, results)
+        if fast_result is not None:
+            logger.debug("✓ %s Complete (fast path): %s", label, fast_result)
+            return fast_result
+        
+        cache_key = None
+        if use_cache and stage in CACHEABLE_STAGES:
+            cache_key = self.cache.make_key(stage, transaction_data, results.get("intent"))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("✓ %s Complete (cached): %s", label, cached)
+                return cached
+        
+        result = self._execute(stage, self._stage_inputs(stage, transaction_data, results))
+        logger.debug("✓ %s Complete: %s", label, result)
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, str(result))
+        return result
+    
+    def _run_pipeline(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute every foreground stage in STAGE_SCHEDULE order, starting each
+        stage as soon as the stages it depends on have finished.
+        
+        Returns:
+            Mapping of stage name to that stage's output
+        """
+        results = {}
+        pending = {
+            stage: STAGE_DEPENDENCIES[stage] for stage in STAGE_SCHEDULE
+            if stage not in BACKGROUND_STAGES
+        }
+        running = {}
+        speculative = {}
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency_limit) as executor:
+            # Speculation only pays off when it doesn't take intent's worker
+            likely_intent = guess_intent(transaction_data) if self.concurrency_limit > 1 else None
+            if likely_intent is not None:
+                for stage in SPECULATIVE_STAGES:
+                    speculative[stage] = executor.submit(
+                        self._run_stage, stage, transaction_data, {"intent": likely_intent}, False
+                    )
+            
+            while pending or running:
+                ready = [
+                    stage for stage, deps in pending.items()
+                    if all(dep in results for dep in deps)
+                ]
+                for stage in ready:
+                    del pending[stage]
+                    future = speculative.pop(stage, None)
+                    if future is None or not same_intent(likely_intent, results["intent"]):
+                        future = executor.submit(self._run_stage, stage, transaction_data, dict(results))
+                    running[future] = stage
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        
+        return results
+    
+    def process_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process a monetary transaction through the AI agent pipeline
+        
+        Args:
+            transaction_data: Dictionary containing transaction details
+            
+        Returns:
+            Final decision and agent outputs. "audit_reference" is a Future
+            resolving to the audit stage output; call .result() to wait for it.
+        """
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_BAR)
+            logger.info("PROCESSING TRANSACTION: %s", transaction_data.get('transaction_id', 'TXN-001'))
+            logger.info(_BAR)
+        
+        entry_ts = datetime.now().isoformat()
+        
+        # Add timestamp if not present
+        if 'timestamp' not in transaction_data:
+            transaction_data['timestamp'] = entry_ts
+        
+        # Look up prior transactions with the same counterparties
+        if 'history' not in transaction_data:
+            transaction_data['history'] = self.memory.format_history(self.memory.recall(transaction_data))
+        if 'sender_history' not in transaction_data:
+            transaction_data['sender_history'] = self.memory.standing(transaction_data)
+        
+        results = self._run_pipeline(transaction_data)
+        self.memory.record(transaction_data, str(results["decision"]))
+        
+        # Audit only records what has already been decided, so it runs
+        # in the background instead of delaying the decision
+        audit_future = self._audit_executor.submit(
+            self._run_stage, "audit", transaction_data, dict(results)
+        )
+        
+        # Compile final output
+        final_output = {
+            "transaction_id": transaction_data.get('transaction_id', 'TXN-001'),
+            "timestamp": entry_ts,
+            "input": transaction_data,
+            "agent_outputs": {
+                stage: str(results[stage]) for stage in STAGE_DEPENDENCIES["audit"]
+            },
+            "final_decision": str(results["decision"]),
+            "audit_reference": audit_future
+        }
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_BAR)
+            logger.info("TRANSACTION PROCESSING COMPLETE")
+            logger.info(_BAR)
+        
+        return final_output
+    
+    async def process_transaction_async(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run process_transaction on a worker thread so transactions can overlap"""
+        return await asyncio.to_thread(self.process_transaction, transaction_data)
+    
+    async def process_transactions_async(
+        self,
+        transactions: List[Dict[str, Any]],
+        max_concurrent: int = 16
+    ) -> List[Dict[str, Any]]:
+        """
+        Process a batch of transactions concurrently
+        
+        Args:
+            transactions: List of transaction dictionaries
+            max_concurrent: Maximum number of transactions in flight at once
+            
+        Returns:
+            Final outputs, in the same order as the input transactions
+        """
+        # asyncio's default executor has at most cpu_count + 4 threads, which
+        # would cap concurrency below max_concurrent; a pool sized to it also
+        # bounds the transactions in flight
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="transaction") as executor:
+            return await asyncio.gather(*(
+                loop.run_in_executor(executor, self.process_transaction, txn)
+                for txn in transactions
+            ))
+
+
+def _configure_logging() -> QueueListener:
+    """
+    Send log records through a queue so stream I/O happens on the listener
+    thread instead of the stage worker threads. Level comes from LOG_LEVEL.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    
+    root_logger = logging.getLogger()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    listener.start()
+    return listener
+
+
+def main():
+    """
+    Main execution function - demonstrates the AI Treasury System
+    """
+    listener = _configure_logging()
+    
+    print("\n" + _BAR)
+    print("AUTONOMOUS AI TREASURY SYSTEM")
+    print(_BAR + "\n")
+    
+    # Initialize the system
+    treasury_system = AITreasurySystem()
+    
+    # Example Transaction 1: Vendor payment at midnight
+    transaction_1 = {
+        "transaction_id": "TXN-20260103-001",
+        "amount": 7500,
+        "sender": "Company Operations",
+        "receiver": "Acme Supplies Ltd",
+        "purpose": "Vendor payment for Q1 supplies invoice #4521",
+        "timestamp": "2026-01-03T00:30:00",
+        "account_id": "primary"
+    }
+    
+    # Example Transaction 2: High-value refund
+    transaction_2 = {
+        "transaction_id": "TXN-20260103-002",
+        "amount": 45000,
+        "sender": "Customer Service",
+        "receiver": "Premium Client Corp",
+        "purpose": "Urgent refund for cancelled enterprise contract",
+        "timestamp": "2026-01-03T14:15:00",
+        "account_id": "primary"
+    }
+    
+    examples = [
+        ("🔍 EXAMPLE 1: Midnight Vendor Payment", transaction_1),
+        ("🔍 EXAMPLE 2: High-Value Refund", transaction_2),
+    ]
+    
+    # Both examples are independent, so process them as one concurrent batch
+    results = asyncio.run(
+        treasury_system.process_transactions_async([txn for _, txn in examples])
+    )
+    
+    for (title, _), result in zip(examples, results):
+        result["audit_reference"] = str(result["audit_reference"].result())
+        
+        print("\n\n" + _BAR)
+        print(title)
+        print("FINAL OUTPUT:")
+        print(_BAR)
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+    
+    print("\n\n" + _BAR)
+    print("ALL TRANSACTIONS PROCESSED")
+    print("System demonstrated: Intent → Risk → Policy → Liquidity → Decision → Audit")
+    print(_BAR + "\n")
+    
+    listener.stop()
+
+
+if __name__ == "__main__":
+    main()